@@ -1,21 +1,189 @@
+import asyncio
+import csv
+import hashlib
+import io
+import os
+import queue
+import re
+import sqlite3
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+import httpx
+import orjson
+from rbloom import Bloom
+import lxml.html
+from lxml import etree
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from urllib.parse import urljoin, urlparse
-import time
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlsplit
+import posixpath
 import logging
 import pandas as pd
-from typing import Dict, Set, List, Optional
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from dataclasses import dataclass
+from functools import lru_cache, partial
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Compiled once; the trailing [1] keeps only the first match in document order
+TITLE_XPATH = etree.XPath(
+    '(//meta[@property="og:title"] | //meta[@name="twitter:title"] | //h1)[1]'
+)
+DESCRIPTION_XPATH = etree.XPath(
+    '(//meta[@name="description"] | //meta[@property="og:description"]'
+    ' | //meta[@name="twitter:description"])[1]'
+)
+IMAGE_XPATH = etree.XPath(
+    '(//meta[@property="og:image"] | //meta[@name="twitter:image"])[1]'
+)
+LINKS_XPATH = etree.XPath("//a/@href")
+
+# Pages with at least this many links are filtered with pandas string methods
+VECTORIZE_MIN_LINKS = 1000
+URL_PARTS_PATTERN = (
+    r"^(?:[^:/?#]+:)?(?://(?P<netloc>[^/?#]*))?(?P<path>[^?#]*)(?:\?(?P<query>[^#]*))?"
+)
+
+RESULT_FIELDS = ["url", "title", "description", "image"]
+MAX_PREVIEW_ROWS = 1000
+
+# The Bloom filter in front of the visited store: ~1.8MB for a million URLs,
+# sending 0.1% of unvisited URLs to SQLite for an exact check
+VISITED_CAPACITY = 1_000_000
+VISITED_ERROR_RATE = 0.001
+# Stays under SQLite's limit on bound parameters per statement
+SQLITE_BATCH_SIZE = 500
+
+
+def _canonicalize(url: str) -> str:
+    """Normalize a URL so trivially different spellings share one visited key"""
+    parts = urlsplit(url)
+    netloc = parts.netloc.lower()
+    for default_port in (":80", ":443"):
+        if netloc.endswith(default_port):
+            netloc = netloc[: -len(default_port)]
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+
+    path = posixpath.normpath(parts.path) if parts.path else "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    # The scheme and fragment are left out so http/https variants collide
+    return f"{netloc}{path}?{query}" if query else f"{netloc}{path}"
+
+
+def _url_keys(urls: Iterable[str]) -> Dict[int, str]:
+    """Map 64-bit canonical URL hashes to the first URL seen for each"""
+    keys = {}
+    for url in urls:
+        try:
+            canonical = _canonicalize(url).encode()
+        except ValueError:
+            continue
+        digest = hashlib.blake2b(canonical, digest_size=8).digest()
+        # Signed so the hash fits an SQLite INTEGER PRIMARY KEY
+        keys.setdefault(int.from_bytes(digest, "big", signed=True), url)
+    return keys
+
+
+@lru_cache(maxsize=8192)
+def _parse(url: str):
+    """Parse a URL, reusing the result for links repeated across pages"""
+    return urlparse(url)
+
+
+def _make_url_validator(
+    excluded_extensions: Tuple[str, ...],
+    bad_params_re: re.Pattern,
+    base_domain: Optional[str],
+) -> Callable[[str], bool]:
+    """Build a URL check with the crawl's fixed exclusions bound as locals"""
+    search_bad_params = bad_params_re.search
+
+    def validate(url: str) -> bool:
+        # Exclude anchor links
+        if "#" in url:
+            return False
+        try:
+            parsed = _parse(url)
+            return (
+                not parsed.path.lower().endswith(excluded_extensions)
+                # Additional checks for query parameters
+                and not search_bad_params(parsed.query)
+                and (not base_domain or parsed.netloc == base_domain)
+            )
+        except:
+            return False
+
+    return validate
+
+
+def _is_html_content_type(content_type: str) -> bool:
+    """Treat missing content types as HTML and let the parser decide"""
+    return not content_type or "html" in content_type.lower()
+
+
+@lru_cache(maxsize=None)
+def _head_client(proxy: Optional[str] = None) -> httpx.Client:
+    """Keep-alive client shared by all HEAD checks, one per proxy setting"""
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+        proxy=proxy,
+        timeout=2,
+    )
+
+
+def _is_probably_html(url: str, proxy: Optional[str] = None) -> bool:
+    """Check the Content-Type with a HEAD request before rendering a page"""
+    try:
+        response = _head_client(proxy).head(url)
+    except Exception:
+        # Only a hint: malformed URLs or proxies are left for the browser to fail
+        return True
+    # Servers that reject HEAD may still serve the page to a browser
+    if response.is_error:
+        return True
+    return _is_html_content_type(response.headers.get("content-type", ""))
+
+
+def _make_dom_settled() -> Callable[[webdriver.Chrome], bool]:
+    """Build a WebDriverWait condition for a loaded page that stopped rendering"""
+    last_size = None
+
+    def settled(driver: webdriver.Chrome) -> bool:
+        nonlocal last_size
+        ready_state, size = driver.execute_script(
+            "return [document.readyState, document.documentElement.outerHTML.length]"
+        )
+        # Scripts may keep rendering after the load event, so the DOM also has
+        # to be the same size on two polls in a row
+        done = ready_state == "complete" and size == last_size
+        last_size = size
+        return done
+
+    return settled
+
 
 @dataclass
 class ScrapingConfig:
@@ -26,15 +194,105 @@ class ScrapingConfig:
     max_depth: int = 1
     use_proxy: bool = False
     proxy: Optional[str] = None
+    render_js: bool = False
+    workers: int = 8
+
+
+class DriverPool:
+    """Pool of WebDrivers, each used by one worker thread at a time"""
+
+    def __init__(self, factory: Callable[[], webdriver.Chrome], size: int):
+        self.factory = factory
+        self.size = size
+        self._idle: "queue.Queue[webdriver.Chrome]" = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> webdriver.Chrome:
+        """Take an idle driver, starting a new one while below the pool size"""
+        with self._lock:
+            start_new = self._idle.empty() and self._started < self.size
+            if start_new:
+                self._started += 1
+
+        if not start_new:
+            return self._idle.get()
+
+        try:
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._started -= 1
+            raise
+
+    def release(self, driver: webdriver.Chrome):
+        """Hand a driver back for the next page"""
+        self._idle.put(driver)
+
+    def close(self):
+        """Quit all drivers once every worker has released its own"""
+        while True:
+            try:
+                self._idle.get_nowait().quit()
+            except queue.Empty:
+                break
+
+
+class VisitedStore:
+    """Visited URL keys stored in SQLite, with a Bloom filter for quick misses"""
+
+    def __init__(self):
+        # Kept on disk so memory stays bounded, and removed after the crawl
+        self._temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self._temp_dir.name, "visited.db")
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE v(h INTEGER PRIMARY KEY)")
+        self._bloom = Bloom(VISITED_CAPACITY, VISITED_ERROR_RATE)
+
+    def filter_new(self, url_hashes: Iterable[int]) -> List[int]:
+        """Return the hashes that have not been visited yet, in order"""
+        url_hashes = list(url_hashes)
+        # Bloom filter misses are exact, so only possible hits query SQLite
+        maybe_seen = [h for h in url_hashes if h in self._bloom]
+        seen = set()
+        for start in range(0, len(maybe_seen), SQLITE_BATCH_SIZE):
+            batch = maybe_seen[start : start + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f"SELECT h FROM v WHERE h IN ({placeholders})", batch
+            )
+            seen.update(h for (h,) in rows)
+        return [h for h in url_hashes if h not in seen]
+
+    def add(self, url_hashes: Iterable[int]):
+        """Record hashes as visited in a single transaction"""
+        url_hashes = list(url_hashes)
+        if not url_hashes:
+            return
+        self._bloom.update(url_hashes)
+        # Commits on exit, or rolls back if an insert fails
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR IGNORE INTO v(h) VALUES (?)", [(h,) for h in url_hashes]
+            )
+
+    def close(self):
+        self._db.close()
+        self._temp_dir.cleanup()
 
 
 class WebScraper:
     def __init__(self, config: ScrapingConfig):
         self.config = config
         self.logger = logger
-        self.visited_urls = set()
+        self.visited_urls = None
         self.base_domain = None
         self.progress_callback = None
+        self._driver_pool = None
         self.total_urls = 0
         self.excluded_extensions = {
             ".js",
@@ -56,6 +314,13 @@ class WebScraper:
             ".zip",
             ".gz",
         }
+        self._excluded_ext_tuple = tuple(self.excluded_extensions)
+        self._bad_params_re = re.compile(
+            r"(?:^|&)(?:replytocom|share|print)=", re.IGNORECASE
+        )
+        self._validate = _make_url_validator(
+            self._excluded_ext_tuple, self._bad_params_re, self.base_domain
+        )
 
     def setup_driver(self) -> webdriver.Chrome:
         """Configure and return Chrome WebDriver"""
@@ -68,20 +333,52 @@ class WebScraper:
         chrome_options.add_argument("--disable-notifications")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_argument("--disable-extensions")
+        # Only the DOM is scraped, so skip images and return once it is parsed
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option(
+            "prefs",
+            {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            },
+        )
+        chrome_options.page_load_strategy = "eager"
 
         if self.config.use_proxy and self.config.proxy:
             chrome_options.add_argument(f"--proxy-server={self.config.proxy}")
 
-        chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        )
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
+
+        driver = webdriver.Chrome(options=chrome_options, keep_alive=True)
+        self._configure_connection_pool(driver)
+        return driver
+
+    def _configure_connection_pool(self, driver: webdriver.Chrome):
+        """Give the driver its own keep-alive pool sized for the worker count"""
+        # webdriver.Chrome does not accept a ClientConfig, so the driver's pool
+        # manager is rebuilt after start; quit() only clears the driver's own pool
+        connection = driver.command_executor
+        connection._client_config.keep_alive = True
+        connection._client_config.init_args_for_pool_manager = {
+            "init_args_for_pool_manager": {
+                "maxsize": self.config.workers * 2,
+                "block": False,
+            }
+        }
+        connection._conn.clear()
+        connection._conn = connection._get_connection_manager()
 
-        return webdriver.Chrome(options=chrome_options)
+    def _http_proxy(self) -> Optional[str]:
+        """Proxy URL for httpx, which needs the scheme that Chrome lets users omit"""
+        proxy = (self.config.proxy or "").strip() if self.config.use_proxy else ""
+        if not proxy:
+            return None
+        return proxy if "://" in proxy else f"http://{proxy}"
 
     def get_domain(self, url: str) -> str:
         """Extract domain from URL"""
         try:
-            return urlparse(url).netloc
+            return _parse(url).netloc
         except:
             return ""
 
@@ -93,131 +390,335 @@ class WebScraper:
 
     def is_valid_url(self, url: str) -> bool:
         """Check if URL should be included"""
-        try:
-            parsed = urlparse(url)
-            path = parsed.path.lower()
-            # Additional checks for query parameters and fragments
-            has_excluded_params = any(
-                param in parsed.query.lower()
-                for param in ["replytocom", "share", "print"]
-            )
-            return (
-                not any(path.endswith(ext) for ext in self.excluded_extensions)
-                and not has_excluded_params
-                and self.is_same_domain(url)
-                and "#" not in url
-            )  # Exclude anchor links
-        except:
-            return False
+        return self._validate(url)
 
-    def get_meta_data(self, driver: webdriver.Chrome, url: str) -> Dict:
-        """Extract metadata from the page"""
+    def parse_html(self, html: Union[str, bytes], url: str) -> Tuple[Dict, List[str]]:
+        """Extract metadata and raw link targets from an HTML document"""
         metadata = {"url": url, "title": "", "description": "", "image": ""}
+        hrefs = []
 
         try:
-            # Get title (try different methods)
-            metadata["title"] = driver.title
-            if not metadata["title"]:
-                title_elem = driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'meta[property="og:title"], meta[name="twitter:title"], h1',
+            tree = lxml.html.fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            self.logger.error(f"Error parsing {url}: {e}")
+            return metadata, hrefs
+
+        # Get title (try different methods)
+        metadata["title"] = tree.findtext(".//title") or ""
+        if not metadata["title"].strip():
+            title_elem = TITLE_XPATH(tree)
+            if title_elem:
+                metadata["title"] = (
+                    title_elem[0].get("content") or title_elem[0].text_content()
                 )
-                if title_elem:
-                    metadata["title"] = (
-                        title_elem[0].get_attribute("content") or title_elem[0].text
-                    )
-
-            # Get meta description
-            desc_elem = driver.find_elements(
-                By.CSS_SELECTOR,
-                'meta[name="description"], meta[property="og:description"], meta[name="twitter:description"]',
-            )
-            if desc_elem:
-                metadata["description"] = desc_elem[0].get_attribute("content")
 
-            # Get share image
-            img_elem = driver.find_elements(
-                By.CSS_SELECTOR, 'meta[property="og:image"], meta[name="twitter:image"]'
-            )
-            if img_elem:
-                metadata["image"] = img_elem[0].get_attribute("content")
+        # Get meta description
+        desc_elem = DESCRIPTION_XPATH(tree)
+        if desc_elem:
+            metadata["description"] = desc_elem[0].get("content") or ""
+
+        # Get share image
+        img_elem = IMAGE_XPATH(tree)
+        if img_elem:
+            metadata["image"] = img_elem[0].get("content") or ""
+
+        # Clean up the data
+        metadata = {k: " ".join(str(v).split()) for k, v in metadata.items()}
+        hrefs = LINKS_XPATH(tree)
+        return metadata, hrefs
+
+    def _filter_links(self, absolute_urls: List[str]) -> List[str]:
+        """Apply the URL check to a whole page of links at once"""
+        urls = pd.Series(absolute_urls, dtype=object)
+        parts = urls.str.extract(URL_PARTS_PATTERN)
+        # urlparse splits ;params off the last path segment before the check
+        path = parts["path"].str.replace(r";[^/]*$", "", regex=True).str.lower()
+        mask = (
+            ~urls.str.contains("#", regex=False)
+            & ~path.str.endswith(self._excluded_ext_tuple)
+            & ~parts["query"].fillna("").str.contains(self._bad_params_re)
+        )
+        if self.base_domain:
+            mask &= parts["netloc"] == self.base_domain
+        return urls[mask].unique().tolist()
+
+    def _collect_links(self, url: str, hrefs: List[str]) -> Dict[int, str]:
+        """Resolve link targets and map URL hashes to the valid URLs"""
+        absolute_urls = []
+        for url_value in hrefs:
+            try:
+                if url_value:
+                    absolute_urls.append(urljoin(url, url_value.strip()))
+            except:
+                continue
+
+        if len(absolute_urls) >= VECTORIZE_MIN_LINKS:
+            valid_urls = self._filter_links(absolute_urls)
+        else:
+            validate = self._validate
+            valid_urls = [u for u in absolute_urls if validate(u)]
+
+        # Canonicalize and hash the whole page's links in one batch
+        return _url_keys(valid_urls)
+
+    def _queue_links(
+        self, frontier: deque, discovered_urls: Dict[int, str], depth: int
+    ):
+        """Mark discovered URLs as visited and queue them at the given depth"""
+        # Runs on the thread consuming results, so no lock is needed; one lookup
+        # per page also skips URLs queued by earlier pages
+        new_hashes = self.visited_urls.filter_new(discovered_urls)
+        self.visited_urls.add(new_hashes)
+
+        for url_hash in new_hashes:
+            frontier.append((discovered_urls[url_hash], depth))
+
+    async def _fetch(
+        self, url: str, client: httpx.AsyncClient
+    ) -> Optional[Tuple[Dict, List[str], str]]:
+        """Download a page and parse it, returning None if the request fails"""
+        try:
+            async with client.stream("GET", url) as response:
+                # Skip downloads, images and other non-HTML bodies unread
+                if not _is_html_content_type(response.headers.get("content-type")):
+                    return None
+                await response.aread()
+        # InvalidURL is not an HTTPError; one malformed link must not fail the depth
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            self.logger.error(f"Error fetching {url}: {e}")
+            return None
+
+        # Raw bytes let lxml honour the XML declaration and meta charset
+        metadata, hrefs = self.parse_html(response.content, url)
+        # Relative links resolve against the final URL after redirects
+        return metadata, hrefs, str(response.url)
+
+    async def _crawl_async(self, url: str, progress_text=None) -> AsyncIterator[Dict]:
+        """Crawl breadth-first over plain HTTP, fetching each depth concurrently"""
+        frontier = deque([(url, 1)])
+        self.visited_urls.add(_url_keys([url]))
+
+        async with httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            proxy=self._http_proxy(),
+            # Requests queue for a free connection instead of timing out
+            timeout=httpx.Timeout(self.config.timeout, pool=None),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        ) as client:
+            while frontier:
+                depth = frontier[0][1]
+                batch = [frontier.popleft()[0] for _ in range(len(frontier))]
+                if progress_text:
+                    progress_text.text(f"Scanning Depth {depth}: {len(batch)} URLs")
 
-            # Clean up the data
-            metadata = {k: str(v).strip() for k, v in metadata.items()}
-            return metadata
+                pages = await asyncio.gather(*[self._fetch(u, client) for u in batch])
 
-        except Exception as e:
-            self.logger.error(f"Error extracting metadata: {e}")
-            return metadata
+                for page_url, page in zip(batch, pages):
+                    if page is None:
+                        continue
+                    metadata, hrefs, final_url = page
+                    self.total_urls += 1
 
-    def extract_urls_and_metadata(
-        self, url: str, current_depth: int = 1, progress_text=None
-    ) -> List[Dict]:
-        """Extract URLs and metadata recursively based on depth"""
-        if not self.base_domain:
-            self.base_domain = self.get_domain(url)
+                    if progress_text:
+                        progress_text.text(
+                            f"Found {self.total_urls} URLs... Processing: {page_url}"
+                        )
 
-        if current_depth > self.config.max_depth:
-            return []
+                    # Queue discovered URLs if not at max depth
+                    if depth < self.config.max_depth:
+                        discovered_urls = self._collect_links(final_url, hrefs)
+                        self._queue_links(frontier, discovered_urls, depth + 1)
 
-        results = []
-        driver = None
+                    yield metadata
 
+    def _reset_driver_if_dead(self, driver: webdriver.Chrome) -> webdriver.Chrome:
+        """Return the driver with a clean cookie jar, restarting it if the session is lost"""
         try:
-            driver = self.setup_driver()
-            if progress_text:
-                progress_text.text(f"Scanning Depth {current_depth}: {url}")
+            if driver.session_id:
+                driver.delete_all_cookies()
+                return driver
+        except Exception:
+            self.logger.warning("WebDriver session lost, restarting browser")
+        driver.quit()
+        return self.setup_driver()
+
+    def _process_one(
+        self, url: str, collect_links: bool = True
+    ) -> Optional[Tuple[Dict, Dict[int, str]]]:
+        """Load a single page on a pooled driver and return its metadata and links"""
+        if not _is_probably_html(url, self._http_proxy()):
+            return None
+
+        driver = self._driver_pool.acquire()
+        try:
+            driver = self._reset_driver_if_dead(driver)
+            driver.get(url)
+            try:
+                # Wait for the page to load and finish rendering, but no longer
+                # than the configured wait
+                max_wait = min(self.config.wait_time, self.config.timeout)
+                WebDriverWait(driver, max_wait).until(_make_dom_settled())
+            except TimeoutException:
+                # Slow pages are still scraped with whatever has rendered
+                pass
+
+            # Parse the rendered DOM locally instead of querying it element by element
+            current_page_data, hrefs = self.parse_html(driver.page_source, url)
+            if not collect_links:
+                return current_page_data, {}
+            # Relative links resolve against the final URL after redirects
+            return current_page_data, self._collect_links(driver.current_url, hrefs)
 
-            if url not in self.visited_urls:
-                self.visited_urls.add(url)
-                driver.get(url)
-                time.sleep(self.config.wait_time)
+        except Exception as e:
+            self.logger.error(f"Error scraping {url}: {e}")
+            return None
 
-                # Get metadata for current page
-                current_page_data = self.get_meta_data(driver, url)
-                results.append(current_page_data)
+        finally:
+            self._driver_pool.release(driver)
+
+    def _extract_with_driver(
+        self, url: str, executor: ThreadPoolExecutor, progress_text=None
+    ) -> Iterator[Dict]:
+        """Crawl breadth-first using JS-rendering browsers, one depth at a time"""
+        frontier = deque([(url, 1)])
+        self.visited_urls.add(_url_keys([url]))
+
+        while frontier:
+            depth = frontier[0][1]
+            batch = [frontier.popleft()[0] for _ in range(len(frontier))]
+            if progress_text:
+                progress_text.text(f"Scanning Depth {depth}: {len(batch)} URLs")
+
+            # Pages at the last depth are scraped without collecting their links
+            process = partial(
+                self._process_one, collect_links=depth < self.config.max_depth
+            )
+            # Pages load in parallel; progress is reported from this thread
+            for page_url, page in zip(batch, executor.map(process, batch)):
+                if page is None:
+                    continue
+                current_page_data, discovered_urls = page
                 self.total_urls += 1
 
                 if progress_text:
                     progress_text.text(
-                        f"Found {self.total_urls} URLs... Processing: {url}"
+                        f"Found {self.total_urls} URLs... Processing: {page_url}"
                     )
 
-                # Find all links in the body
-                elements = driver.find_elements(By.TAG_NAME, "a")
-                discovered_urls = set()
-
-                for element in elements:
-                    try:
-                        url_value = element.get_attribute("href")
-                        if url_value:
-                            absolute_url = urljoin(url, url_value)
-                            if (
-                                absolute_url not in discovered_urls
-                                and absolute_url not in self.visited_urls
-                                and self.is_valid_url(absolute_url)
-                            ):
-                                discovered_urls.add(absolute_url)
-                    except:
-                        continue
+                # Queue discovered URLs if not at max depth
+                if depth < self.config.max_depth:
+                    self._queue_links(frontier, discovered_urls, depth + 1)
 
-                # Process discovered URLs if not at max depth
-                if current_depth < self.config.max_depth:
-                    for discovered_url in discovered_urls:
-                        sub_results = self.extract_urls_and_metadata(
-                            discovered_url, current_depth + 1, progress_text
-                        )
-                        results.extend(sub_results)
+                yield current_page_data
 
-            return results
+    def extract_urls_and_metadata(self, url: str, progress_text=None) -> Iterator[Dict]:
+        """Yield metadata for each URL as it is scraped, crawling based on depth"""
+        if not self.base_domain:
+            self.base_domain = self.get_domain(url)
+        self._validate = _make_url_validator(
+            self._excluded_ext_tuple, self._bad_params_re, self.base_domain
+        )
 
+        self.visited_urls = VisitedStore()
+        try:
+            if self.config.render_js:
+                yield from self._extract_with_browsers(url, progress_text)
+            else:
+                yield from self._extract_over_http(url, progress_text)
+        finally:
+            self.visited_urls.close()
+
+    def _extract_with_browsers(self, url: str, progress_text=None) -> Iterator[Dict]:
+        """Run the JS-rendering crawl with pooled browsers"""
+        # Browsers are reused across pages, one per worker thread
+        self._driver_pool = DriverPool(self.setup_driver, self.config.workers)
+        try:
+            with ThreadPoolExecutor(max_workers=self.config.workers) as executor:
+                yield from self._extract_with_driver(url, executor, progress_text)
         except Exception as e:
             self.logger.error(f"Error in scraping process: {e}")
-            return results
+        finally:
+            self._driver_pool.close()
+            self._driver_pool = None
 
+    def _extract_over_http(self, url: str, progress_text=None) -> Iterator[Dict]:
+        """Drive the async crawl from this generator one page at a time"""
+        loop = asyncio.new_event_loop()
+        pages = self._crawl_async(url, progress_text)
+        try:
+            while True:
+                yield loop.run_until_complete(pages.__anext__())
+        except StopAsyncIteration:
+            pass
+        except Exception as e:
+            self.logger.error(f"Error in scraping process: {e}")
         finally:
-            if driver:
-                driver.quit()
+            loop.run_until_complete(pages.aclose())
+            loop.close()
+
+
+def export_results(results: Iterable[Dict]) -> Tuple[List[Dict], int, str, bytes]:
+    """Write results to CSV and JSON in one pass, keeping only a preview in memory"""
+    preview = []
+    total = 0
+    csv_buffer = io.StringIO()
+    writer = csv.DictWriter(csv_buffer, fieldnames=RESULT_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    json_buffer = io.BytesIO()
+    json_buffer.write(b"[")
+
+    for row in results:
+        writer.writerow(row)
+        if total:
+            json_buffer.write(b",")
+        json_buffer.write(orjson.dumps(row))
+        if len(preview) < MAX_PREVIEW_ROWS:
+            preview.append(row)
+        total += 1
+
+    json_buffer.write(b"]")
+    return preview, total, csv_buffer.getvalue(), json_buffer.getvalue()
+
+
+class NoResultsError(Exception):
+    """Raised when a crawl scrapes no pages, so the empty result is not cached"""
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def run_crawl(
+    url: str,
+    max_depth: int,
+    wait_time: int,
+    use_proxy: bool,
+    proxy: Optional[str],
+    render_js: bool,
+) -> Tuple[List[Dict], int, str, bytes]:
+    """Crawl a site and export the results, reused when the same analysis reruns"""
+    config = ScrapingConfig(
+        wait_time=wait_time,
+        max_depth=max_depth,
+        use_proxy=use_proxy,
+        proxy=proxy,
+        render_js=render_js,
+    )
+    scraper = WebScraper(config)
+
+    # Progress goes to a placeholder owned by this function so cache hits can
+    # replay it, and is cleared once the crawl is done
+    progress_text = st.empty()
+    try:
+        results = export_results(
+            scraper.extract_urls_and_metadata(url, progress_text=progress_text)
+        )
+    finally:
+        progress_text.empty()
+
+    # Errors are logged during the crawl, so an empty crawl may be a failed one
+    if not results[1]:
+        raise NoResultsError(url)
+    return results
 
 
 def main():
@@ -240,85 +741,85 @@ def main():
 
     # Advanced settings in expander
     with st.expander("Advanced Settings"):
+        render_js = st.checkbox(
+            "Render JavaScript",
+            False,
+            help="Load pages in a headless browser (slower, for JS-rendered sites)",
+        )
         wait_time = st.slider(
-            "Wait Time (seconds)", 1, 10, 3, help="Time to wait for each page to load"
+            "Wait Time (seconds)",
+            1,
+            10,
+            3,
+            help="Maximum time to wait for each page to load when rendering JavaScript",
         )
         use_proxy = st.checkbox("Use Proxy", False)
         proxy = st.text_input("Proxy URL (if enabled):", "") if use_proxy else None
 
-    # Create config
-    config = ScrapingConfig(
-        wait_time=wait_time, max_depth=max_depth, use_proxy=use_proxy, proxy=proxy
-    )
-
-    # Initialize scraper
-    scraper = WebScraper(config)
-
     # Display domain info
+    domain = urlparse(url).netloc if url else ""
     if url:
-        domain = scraper.get_domain(url)
         st.info(f"Will only analyze URLs from domain: {domain}")
 
     # Scraping button
     if st.button("Start Analysis"):
         try:
             with st.spinner("Analyzing website..."):
-                progress_text = st.empty()
-                progress_bar = st.progress(0)
-                scraper.total_urls = 0
-
-                results = scraper.extract_urls_and_metadata(
-                    url, progress_text=progress_text
+                preview, total, csv_data, json_data = run_crawl(
+                    url, max_depth, wait_time, use_proxy, proxy, render_js
                 )
 
-                if results:
-                    # Convert results to DataFrame
-                    df = pd.DataFrame(results)
-
-                    # Display statistics
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Total URLs Found", len(df))
-                    with col2:
-                        st.metric("Scan Depth", max_depth)
-                    with col3:
-                        st.metric("Domain", scraper.base_domain)
-
-                    # Display results table
-                    st.subheader("🔍 Discovered URLs and Metadata")
-
-                    # Format the DataFrame
-                    st.dataframe(
-                        df.style.set_properties(
-                            **{
-                                "white-space": "nowrap",
-                                "overflow": "hidden",
-                                "text-overflow": "ellipsis",
-                                "max-width": "0",
-                            }
-                        ),
-                        height=400,
+                # Convert the preview rows to a DataFrame
+                df = pd.DataFrame(preview, columns=RESULT_FIELDS)
+
+                # Display statistics
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Total URLs Found", total)
+                with col2:
+                    st.metric("Scan Depth", max_depth)
+                with col3:
+                    st.metric("Domain", domain)
+
+                # Display results table
+                st.subheader("🔍 Discovered URLs and Metadata")
+                if total > len(preview):
+                    st.caption(
+                        f"Showing the first {len(preview)} of {total} URLs; "
+                        "downloads include all of them"
                     )
 
-                    # Download options
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.download_button(
-                            "Download Results (CSV)",
-                            df.to_csv(index=False),
-                            "discovered_urls.csv",
-                            "text/csv",
-                        )
-                    with col2:
-                        st.download_button(
-                            "Download Results (JSON)",
-                            df.to_json(orient="records"),
-                            "discovered_urls.json",
-                            "application/json",
-                        )
-                else:
-                    st.warning("No URLs found or error occurred during analysis")
+                # Format the DataFrame
+                st.dataframe(
+                    df.style.set_properties(
+                        **{
+                            "white-space": "nowrap",
+                            "overflow": "hidden",
+                            "text-overflow": "ellipsis",
+                            "max-width": "0",
+                        }
+                    ),
+                    height=400,
+                )
 
+                # Download options
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.download_button(
+                        "Download Results (CSV)",
+                        csv_data,
+                        "discovered_urls.csv",
+                        "text/csv",
+                    )
+                with col2:
+                    st.download_button(
+                        "Download Results (JSON)",
+                        json_data,
+                        "discovered_urls.json",
+                        "application/json",
+                    )
+        except NoResultsError:
+            st.warning("No URLs found or error occurred during analysis")
         except Exception as e:
             st.error(f"Error occurred during analysis: {str(e)}")
             logger.error(f"Analysis error: {e}", exc_info=True)
@@ -336,6 +837,7 @@ def main():
         - Discovers URLs from the same domain only
         - Extracts page titles, descriptions, and share images
         - Excludes resource files (js, css, images, etc.)
+        - Fetches pages concurrently, with optional JavaScript rendering
         - Shows real-time progress
         - Exports results in CSV or JSON format
         """